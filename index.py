@@ -1,11 +1,22 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import asyncio
+import httpx
 import json
+import logging
+import orjson
 import time
 import os
-from typing import Dict, Any, Optional
-from functools import lru_cache
+import hashlib
+import math
+import re
+import sys
+from collections import OrderedDict
+from types import CodeType, MappingProxyType, SimpleNamespace
+from typing import Callable, Dict, Any, Optional
+from functools import wraps
+from operator import add, mul, sub, truediv
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from diskcache import Cache
 from dotenv import load_dotenv
 
 # Cargar variables de entorno desde .env
@@ -21,81 +32,209 @@ if not TOKEN:
     print("   Crea un archivo .env con: API_TOKEN=tu_token")
     exit(1)
 
-HEADERS = {
+# Solo lectura: se comparte entre todas las solicitudes y no debe mutarse
+HEADERS = MappingProxyType({
     "Authorization": f"Bearer {TOKEN}",
     "Content-Type": "application/json"
-}
+})
+
+# Logging asíncrono: los mensajes se encolan y un hilo en segundo plano
+# (QueueListener, iniciado en main()) los escribe en stdout, para que la
+# E/S de consola no bloquee el event loop
+_log_queue: SimpleQueue = SimpleQueue()
+log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+logger = logging.getLogger("challenge")
+logger.addHandler(QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+# Detalle de la resolución de cada problema (consultas, interpretación, resultado)
+solver_logger = logging.getLogger("challenge.solver")
 
 BASE_URL = "https://recruiting.adere.so"
 SWAPI_URL = "https://swapi.dev/api"
 POKEAPI_URL = "https://pokeapi.co/api/v2"
+SOLUTION_URL = f"{BASE_URL}/challenge/solution"
 
-# Crear sesión HTTP con reintentos automáticos
-session = requests.Session()
-retry = Retry(
-    total=3,
-    backoff_factor=0.3,
-    status_forcelist=[500, 502, 503, 504]
-)
-adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-session.mount('http://', adapter)
-session.mount('https://', adapter)
+# Sesión HTTP única (se crea una sola vez en main() y se reutiliza para el
+# servidor del desafío y las APIs externas). Con HTTP/2 todas las consultas a
+# un mismo host se multiplexan sobre una sola conexión.
+session: Optional[httpx.AsyncClient] = None
+
+def create_session() -> httpx.AsyncClient:
+    """Crea la sesión compartida: HTTP/2, pool keep-alive y reintentos de conexión"""
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=75)
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=3),
+        timeout=10.0
+    )
+
+# Reintentos en GET, como el Retry(total=3) de urllib3: hasta 3 reintentos
+# (4 intentos) ante 5xx o errores de transporte (timeouts, conexiones
+# cortadas). Los POST nunca se reintentan para no enviar dos veces una solución.
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {500, 502, 503, 504}
+
+async def get_with_retry(url: str, **kwargs) -> httpx.Response:
+    """GET que reintenta ante 5xx y errores de transporte con backoff exponencial
+    y ante 429 respetando Retry-After"""
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        last_attempt = attempt == RETRY_ATTEMPTS
+        try:
+            response = await session.get(url, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+            continue
+        if last_attempt:
+            return response
+        if response.status_code in RETRY_STATUSES:
+            delay = RETRY_BACKOFF * 2 ** attempt
+        elif response.status_code == 429:
+            try:
+                delay = float(response.headers.get("Retry-After", "1"))
+            except ValueError:
+                delay = 1.0
+        else:
+            return response
+        await asyncio.sleep(delay)
+
+# Concurrencia máxima por API externa (se crean en main(), dentro del event loop)
+SWAPI_CONCURRENCY = 4
+POKEAPI_CONCURRENCY = 8
+swapi_semaphore: Optional[asyncio.Semaphore] = None
+pokeapi_semaphore: Optional[asyncio.Semaphore] = None
+
+async def fetch_json(url: str, semaphore: asyncio.Semaphore, params: Optional[Dict] = None) -> Dict:
+    """GET acotado por el semáforo del host; los reintentos (incluida la espera
+    de un 429) ocurren antes de liberar el semáforo, para no reventar el límite
+    con otra ráfaga"""
+    async with semaphore:
+        response = await get_with_retry(url, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+# Cache persistente en disco (L2): los datos de SWAPI/PokeAPI no cambian
+# entre ejecuciones, así que sobreviven al proceso
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+swapi_disk_cache = Cache(os.path.join(CACHE_DIR, "swapi"))
+pokeapi_disk_cache = Cache(os.path.join(CACHE_DIR, "pokeapi"))
+solutions_disk_cache = Cache(os.path.join(CACHE_DIR, "solutions"))
+
+POKEAPI_CACHE_TTL = 7 * 24 * 60 * 60  # 7 días
+
+def _normalize_key(args: tuple) -> tuple:
+    """Normaliza nombres para que 'Luke ' y 'luke' compartan entrada"""
+    return tuple(arg.strip().lower() if isinstance(arg, str) else arg for arg in args)
+
+def async_lru_cache(maxsize: Optional[int] = 128, disk: Optional[Cache] = None, expire: Optional[float] = None):
+    """Equivalente a lru_cache para corrutinas: cachea el resultado, no la corrutina.
+    
+    Si se entrega `disk`, se usa como segundo nivel persistente (L1 memoria → L2 disco → red).
+    Con `maxsize=None` la memoria no tiene límite. `wrapper.prime(result, *args)`
+    permite precargar un resultado sin llamar a la función.
+    """
+    def decorator(func):
+        cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+        def remember(key: tuple, result: Any):
+            cache[key] = result
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @wraps(func)
+        async def wrapper(*args):
+            key = _normalize_key(args)
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            if disk is not None:
+                result = disk.get((func.__name__,) + key)
+                if result is not None:
+                    remember(key, result)
+                    return result
+            result = await func(*args)
+            # No cachear fallos: un error de red no debe quedar guardado
+            if result is not None:
+                remember(key, result)
+                if disk is not None:
+                    disk.set((func.__name__,) + key, result, expire=expire)
+            return result
+
+        wrapper.cache = cache
+        wrapper.prime = lambda result, *args: remember(_normalize_key(args), result)
+        return wrapper
+    return decorator
 
 # ============================================
 # FUNCIONES PARA CONSULTAR APIs (CON CACHE)
 # ============================================
 
-@lru_cache(maxsize=128)
-def get_star_wars_character(name: str) -> Optional[Dict]:
-    """Obtiene información de un personaje de Star Wars"""
+def character_from_swapi(char: Dict, homeworld_name: Optional[str]) -> Dict:
+    """Convierte un registro de /people/ al formato usado en las operaciones"""
+    return {
+        'name': char['name'],
+        'height': float(char['height']) if char['height'] != 'unknown' else 0,
+        'mass': float(char['mass'].replace(',', '')) if char['mass'] != 'unknown' else 0,
+        'homeworld': homeworld_name
+    }
+
+def planet_from_swapi(planet: Dict) -> Dict:
+    """Convierte un registro de /planets/ al formato usado en las operaciones"""
+    return {
+        'name': planet['name'],
+        'rotation_period': float(planet['rotation_period']) if planet['rotation_period'] != 'unknown' else 0,
+        'orbital_period': float(planet['orbital_period']) if planet['orbital_period'] != 'unknown' else 0,
+        'diameter': float(planet['diameter']) if planet['diameter'] != 'unknown' else 0,
+        'surface_water': float(planet['surface_water']) if planet['surface_water'] != 'unknown' else 0,
+        'population': float(planet['population']) if planet['population'] != 'unknown' else 0
+    }
+
+# URL de planeta → nombre, armado en warm_caches() para resolver homeworlds sin red
+PLANET_URL_TO_NAME: Dict[str, str] = {}
+
+# Sin límite de memoria: los índices completos se precargan en warm_caches()
+@async_lru_cache(maxsize=None, disk=swapi_disk_cache)
+async def get_star_wars_character(name: str, needs_homeworld: bool = True) -> Optional[Dict]:
+    """Obtiene información de un personaje de Star Wars.
+    
+    El homeworld requiere una segunda consulta, así que solo se resuelve si
+    `needs_homeworld` es True; en otro caso queda en None.
+    """
     try:
-        response = session.get(f"{SWAPI_URL}/people/?search={name}", timeout=10)
-        data = response.json()
+        data = await fetch_json(f"{SWAPI_URL}/people/", swapi_semaphore, params={"search": name})
         if data['results']:
             char = data['results'][0]
-            # Obtener el nombre del homeworld
+            # Obtener el nombre del homeworld apenas llega el personaje
             homeworld_url = char.get('homeworld')
             homeworld_name = None
-            if homeworld_url:
-                hw_response = session.get(homeworld_url, timeout=10)
-                homeworld_name = hw_response.json().get('name')
+            if needs_homeworld and homeworld_url:
+                homeworld_name = PLANET_URL_TO_NAME.get(homeworld_url)
+                if homeworld_name is None:
+                    homeworld_name = (await fetch_json(homeworld_url, swapi_semaphore)).get('name')
             
-            return {
-                'name': char['name'],
-                'height': float(char['height']) if char['height'] != 'unknown' else 0,
-                'mass': float(char['mass'].replace(',', '')) if char['mass'] != 'unknown' else 0,
-                'homeworld': homeworld_name
-            }
+            return character_from_swapi(char, homeworld_name)
     except Exception as e:
-        print(f"⚠️ Error obteniendo personaje {name}: {e}")
+        solver_logger.warning(f"⚠️ Error obteniendo personaje {name}: {e}")
     return None
 
-@lru_cache(maxsize=128)
-def get_star_wars_planet(name: str) -> Optional[Dict]:
+@async_lru_cache(maxsize=None, disk=swapi_disk_cache)
+async def get_star_wars_planet(name: str) -> Optional[Dict]:
     """Obtiene información de un planeta de Star Wars"""
     try:
-        response = session.get(f"{SWAPI_URL}/planets/?search={name}", timeout=10)
-        data = response.json()
+        data = await fetch_json(f"{SWAPI_URL}/planets/", swapi_semaphore, params={"search": name})
         if data['results']:
-            planet = data['results'][0]
-            return {
-                'name': planet['name'],
-                'rotation_period': float(planet['rotation_period']) if planet['rotation_period'] != 'unknown' else 0,
-                'orbital_period': float(planet['orbital_period']) if planet['orbital_period'] != 'unknown' else 0,
-                'diameter': float(planet['diameter']) if planet['diameter'] != 'unknown' else 0,
-                'surface_water': float(planet['surface_water']) if planet['surface_water'] != 'unknown' else 0,
-                'population': float(planet['population']) if planet['population'] != 'unknown' else 0
-            }
+            return planet_from_swapi(data['results'][0])
     except Exception as e:
-        print(f"⚠️ Error obteniendo planeta {name}: {e}")
+        solver_logger.warning(f"⚠️ Error obteniendo planeta {name}: {e}")
     return None
 
-@lru_cache(maxsize=128)
-def get_pokemon(name: str) -> Optional[Dict]:
+@async_lru_cache(maxsize=None, disk=pokeapi_disk_cache, expire=POKEAPI_CACHE_TTL)
+async def get_pokemon(name: str) -> Optional[Dict]:
     """Obtiene información de un Pokémon"""
     try:
-        response = session.get(f"{POKEAPI_URL}/pokemon/{name.lower()}", timeout=10)
-        data = response.json()
+        data = await fetch_json(f"{POKEAPI_URL}/pokemon/{name.lower()}", pokeapi_semaphore)
         return {
             'name': data['name'],
             'base_experience': float(data['base_experience']) if data['base_experience'] else 0,
@@ -103,294 +242,730 @@ def get_pokemon(name: str) -> Optional[Dict]:
             'weight': float(data['weight'])
         }
     except Exception as e:
-        print(f"⚠️ Error obteniendo pokemon {name}: {e}")
+        solver_logger.warning(f"⚠️ Error obteniendo pokemon {name}: {e}")
     return None
 
 # ============================================
-# FUNCIÓN PARA INTERPRETAR PROBLEMA CON IA
+# PARSER LOCAL (SIN IA) PARA PLANTILLAS COMUNES
 # ============================================
 
-def interpret_problem(problem_text: str) -> Dict[str, Any]:
-    """Usa IA para interpretar el problema y extraer la operación"""
+# Nombres frecuentes; se completan con los catálogos de SWAPI/PokeAPI en warm_caches()
+KNOWN_CHARACTERS = {
+    "Luke Skywalker", "C-3PO", "R2-D2", "Darth Vader", "Leia Organa", "Owen Lars",
+    "Beru Whitesun lars", "R5-D4", "Biggs Darklighter", "Obi-Wan Kenobi",
+    "Anakin Skywalker", "Chewbacca", "Han Solo", "Greedo", "Jabba Desilijic Tiure",
+    "Wedge Antilles", "Yoda", "Palpatine", "Boba Fett", "Lando Calrissian",
+    "Padmé Amidala", "Qui-Gon Jinn", "Mace Windu", "Jar Jar Binks", "Darth Maul"
+}
+KNOWN_PLANETS = {
+    "Tatooine", "Alderaan", "Yavin IV", "Hoth", "Dagobah", "Bespin", "Endor",
+    "Naboo", "Coruscant", "Kamino", "Geonosis", "Utapau", "Mustafar", "Kashyyyk"
+}
+KNOWN_POKEMON = {
+    "bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard",
+    "squirtle", "wartortle", "blastoise", "pikachu", "raichu", "jigglypuff",
+    "meowth", "psyduck", "machop", "geodude", "onix", "gengar", "eevee",
+    "snorlax", "mewtwo", "mew", "dragonite", "gyarados", "lapras"
+}
+
+# Palabra clave del enunciado → operador
+OPERATION_KEYWORDS = {
+    "multiplica": "*", "multiplicar": "*", "multiply": "*",
+    "suma": "+", "sumar": "+", "add": "+",
+    "divide": "/", "dividir": "/",
+    "resta": "-", "restar": "-", "subtract": "-"
+}
+
+# Palabra(s) clave de atributo → atributo de la entidad (las más largas primero en el regex)
+ATTRIBUTE_KEYWORDS = {
+    "masa": "mass", "mass": "mass",
+    "altura": "height", "height": "height",
+    "peso": "weight", "weight": "weight",
+    "experiencia base": "base_experience", "experiencia": "base_experience",
+    "base experience": "base_experience", "experience": "base_experience",
+    "periodo de rotación": "rotation_period", "período de rotación": "rotation_period",
+    "periodo de rotacion": "rotation_period", "rotation period": "rotation_period",
+    "periodo orbital": "orbital_period", "período orbital": "orbital_period",
+    "orbital period": "orbital_period",
+    "diámetro": "diameter", "diametro": "diameter", "diameter": "diameter",
+    "agua superficial": "surface_water", "surface water": "surface_water",
+    "población": "population", "poblacion": "population", "population": "population"
+}
+
+VALID_ATTRIBUTES = {
+    "character": {"height", "mass"},
+    "planet": {"rotation_period", "orbital_period", "diameter", "surface_water", "population"},
+    "pokemon": {"base_experience", "height", "weight"}
+}
+
+# Conectores aceptados entre los dos operandos. En la resta "resta A de/a B"
+# el orden se invierte (B - A); en el resto se mantiene el orden del texto.
+OPERAND_CONNECTORS = {
+    "*": {"por", "by", "and", "y", "con", "with"},
+    "+": {"y", "con", "más", "mas", "a", "and", "to", "with", "plus"},
+    "/": {"entre", "por", "by"},
+    "-": {"de", "a", "from"}
+}
+SWAPPED_OPERATIONS = {"-"}
+
+OPERATION_RE = re.compile(r"\b(" + "|".join(OPERATION_KEYWORDS) + r")\b")
+ATTRIBUTE_RE = re.compile(
+    r"\b(" + "|".join(sorted(ATTRIBUTE_KEYWORDS, key=len, reverse=True)) + r")\s+(?:de|del|of)\s+"
+)
+NAME_TOKEN_RE = re.compile(r"[\w'\-]+")
+ARTICLES = {"la", "el", "los", "las", "the"}
+SENTENCE_END_RE = re.compile(r"[.!?]")
+CLOSING_CHARS = " \t\n,;:)]\"'»"
+TRAILING_OPERATION_RE = re.compile(
+    r"\d|\b(más|mas|menos|por|entre|cuadrado|cubo|doble|triple|mitad|total"
+    r"|s[uú]ma\w*|r[eé]sta\w*|multiplic\w*|divid\w*|plus|minus|times|twice|half|squared?)\b"
+)
+MAX_NAME_TOKENS = 4
+WARM_POKEMON_COUNT = 151
+
+# Alias en minúsculas → (tipo, nombre canónico); se reconstruye tras cargar catálogos
+_name_index: Dict[str, tuple] = {}
+
+def build_name_index():
+    """Indexa nombres completos y, si no son ambiguas, sus palabras sueltas ('Luke')"""
+    full_names = {}
+    for kind, names in (("character", KNOWN_CHARACTERS), ("planet", KNOWN_PLANETS), ("pokemon", KNOWN_POKEMON)):
+        for name in names:
+            full_names[name.lower()] = (kind, name)
+    
+    token_owners: Dict[str, set] = {}
+    for alias, entry in full_names.items():
+        for token in alias.split():
+            if len(token) >= 3:
+                token_owners.setdefault(token, set()).add(entry)
+    
+    index = {token: owners.pop() for token, owners in token_owners.items()
+             if len(owners) == 1 and token not in full_names}
+    index.update(full_names)
     
-    prompt = f"""Analiza este problema y convierte a JSON.
-
-PROBLEMA: {problem_text}
-
-PASO 1 - Identifica entidades:
-- Personajes de Star Wars
-- Planetas de Star Wars  
-- Pokémon
-
-PASO 2 - Convierte la operación matemática a Python usando estas reglas ESTRICTAS:
-- Primer personaje en la lista → character1
-- Segundo personaje en la lista → character2
-- Primer planeta en la lista → planet1
-- Segundo planeta en la lista → planet2
-- Primer pokémon en la lista → pokemon1
-- Segundo pokémon en la lista → pokemon2
-
-ATRIBUTOS:
-- character1.height, character1.mass, character1.homeworld
-- planet1.rotation_period, planet1.orbital_period, planet1.diameter, planet1.surface_water, planet1.population
-- pokemon1.base_experience, pokemon1.height, pokemon1.weight
-
-EJEMPLO:
-Problema: "Luke (masa 77) entrena con Pikachu (experiencia 112). Multiplica la masa de Luke por la experiencia de Pikachu."
-Respuesta correcta:
-{{
-  "characters": ["Luke Skywalker"],
-  "planets": [],
-  "pokemon": ["Pikachu"],
-  "operation": "character1.mass * pokemon1.base_experience"
-}}
-
-RESPONDE SOLO JSON (sin markdown, sin texto extra):
-{{
-  "characters": [...],
-  "planets": [...],
-  "pokemon": [...],
-  "operation": "..."
-}}"""
+    global _name_index
+    _name_index = index
 
+async def _fetch_all(url: str, semaphore: asyncio.Semaphore) -> list:
+    """Descarga todas las páginas de un listado; tras la primera, el resto en paralelo"""
+    first = await fetch_json(url, semaphore)
+    records = list(first['results'])
+    if first.get('next') and first['results']:
+        pages = math.ceil(first['count'] / len(first['results']))
+        rest = await asyncio.gather(
+            *[fetch_json(url, semaphore, params={"page": page}) for page in range(2, pages + 1)]
+        )
+        for data in rest:
+            records.extend(data['results'])
+    return records
+
+async def warm_caches():
+    """Precarga, antes de iniciar el cronómetro, los índices completos de
+    SWAPI (personas y planetas) y la primera generación de Pokémon. También
+    alimenta los catálogos de nombres del parser local."""
+    people, planets, pokemon = await asyncio.gather(
+        _fetch_all(f"{SWAPI_URL}/people/", swapi_semaphore),
+        _fetch_all(f"{SWAPI_URL}/planets/", swapi_semaphore),
+        _fetch_all(f"{POKEAPI_URL}/pokemon?limit=2000", pokeapi_semaphore),
+        return_exceptions=True
+    )
+    
+    if isinstance(planets, Exception):
+        solver_logger.warning(f"⚠️ Error precargando planetas: {planets}")
+    else:
+        KNOWN_PLANETS.update(planet['name'] for planet in planets)
+        PLANET_URL_TO_NAME.update({planet['url']: planet['name'] for planet in planets})
+        for planet in planets:
+            get_star_wars_planet.prime(planet_from_swapi(planet), planet['name'])
+    
+    if isinstance(people, Exception):
+        solver_logger.warning(f"⚠️ Error precargando personajes: {people}")
+    else:
+        KNOWN_CHARACTERS.update(char['name'] for char in people)
+        for char in people:
+            homeworld_name = PLANET_URL_TO_NAME.get(char.get('homeworld'))
+            data = character_from_swapi(char, homeworld_name)
+            get_star_wars_character.prime(data, char['name'], False)
+            # Si el planeta no está en el índice, el homeworld se resuelve por red al pedirlo
+            if homeworld_name is not None:
+                get_star_wars_character.prime(data, char['name'], True)
+    
+    if isinstance(pokemon, Exception):
+        solver_logger.warning(f"⚠️ Error precargando pokémon: {pokemon}")
+    else:
+        KNOWN_POKEMON.update(poke['name'] for poke in pokemon)
+        # Detalle solo de la primera generación (el listado viene ordenado por número)
+        await asyncio.gather(*[get_pokemon(poke['name']) for poke in pokemon[:WARM_POKEMON_COUNT]])
+    
+    build_name_index()
+
+def _match_name(text: str, start: int) -> Optional[tuple]:
+    """Busca el nombre conocido más largo que comienza en `start`"""
+    tokens = []
+    for match in NAME_TOKEN_RE.finditer(text, start):
+        # Los tokens deben ser consecutivos (solo espacios entre ellos)
+        if tokens and text[tokens[-1].end():match.start()].strip():
+            break
+        if not tokens and text[start:match.start()].strip():
+            return None
+        tokens.append(match)
+        if len(tokens) == MAX_NAME_TOKENS:
+            break
+    
+    for count in range(len(tokens), 0, -1):
+        alias = " ".join(t.group() for t in tokens[:count])
+        if alias in _name_index:
+            return _name_index[alias], tokens[count - 1].end()
+    return None
+
+def parse_problem(problem_text: str) -> Optional[Dict[str, Any]]:
+    """Interpreta sin IA problemas del tipo 'Multiplica la masa de X por la
+    experiencia de Y'. Devuelve None si el texto no calza con certeza."""
+    text = problem_text.lower()
+    
+    operators = {OPERATION_KEYWORDS[m.group(1)] for m in OPERATION_RE.finditer(text)}
+    if len(operators) != 1:
+        return None
+    operator = operators.pop()
+    verb_position = OPERATION_RE.search(text).start()
+    
+    # Referencias "<atributo> de <nombre>"
+    refs = []
+    for match in ATTRIBUTE_RE.finditer(text):
+        found = _match_name(text, match.end())
+        if found is None:
+            # Referencia a una entidad desconocida: no es seguro ignorarla
+            return None
+        (kind, name), end = found
+        attribute = ATTRIBUTE_KEYWORDS[match.group(1)]
+        if attribute not in VALID_ATTRIBUTES[kind]:
+            return None
+        refs.append((match.start(), end, kind, name, attribute))
+    
+    if len(refs) != 2 or refs[0][0] < verb_position:
+        return None
+    
+    connector = [w for w in text[refs[0][1]:refs[1][0]].split() if w not in ARTICLES]
+    if len(connector) != 1 or connector[0] not in OPERAND_CONNECTORS[operator]:
+        return None
+    
+    # Tras la segunda referencia solo puede cerrarse la oración, y en el resto
+    # del texto no puede haber más números ni operaciones ("y por 2", "al cuadrado")
+    tail = text[refs[1][1]:]
+    sentence_end = SENTENCE_END_RE.search(tail)
+    sentence_tail = tail[:sentence_end.start()] if sentence_end else tail
+    if sentence_tail.strip(CLOSING_CHARS) or TRAILING_OPERATION_RE.search(tail):
+        return None
+    
+    # Nombrar entidades por tipo y orden de aparición (character1, pokemon1, ...)
+    interpretation = {"characters": [], "planets": [], "pokemon": []}
+    list_keys = {"character": "characters", "planet": "planets", "pokemon": "pokemon"}
+    operands = []
+    for _, _, kind, name, attribute in refs:
+        names = interpretation[list_keys[kind]]
+        if name not in names:
+            names.append(name)
+        operands.append(f"{kind}{names.index(name) + 1}.{attribute}")
+    
+    if operator in SWAPPED_OPERATIONS:
+        operands.reverse()
+    interpretation["operation"] = f" {operator} ".join(operands)
+    return interpretation
+
+build_name_index()
+
+# ============================================
+# FUNCIÓN PARA INTERPRETAR PROBLEMA CON IA
+# ============================================
+
+# Instrucciones mínimas: el modo json_object garantiza JSON sin markdown
+INTERPRET_PROMPT = (
+    "Extrae del problema un JSON {characters, planets, pokemon, operation}: listas de nombres completos "
+    "(Star Wars / Pokémon) en orden de aparición y la operación en Python usando character1, character2, "
+    "planet1, pokemon1... Atributos: character(height, mass, homeworld), planet(rotation_period, "
+    "orbital_period, diameter, surface_water, population), pokemon(base_experience, height, weight)."
+)
+
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+async def interpret_problem(problem_text: str) -> Dict[str, Any]:
+    """Usa IA para interpretar el problema y extraer la operación"""
     try:
-        response = session.post(
+        response = await session.post(
             f"{BASE_URL}/chat_completion",
             headers=HEADERS,
-            json={
+            content=orjson.dumps({
                 "model": "gpt-4o-mini",
                 "messages": [
-                    {"role": "developer", "content": "Extrae información estructurada. Responde SOLO JSON válido."},
-                    {"role": "user", "content": prompt}
+                    {"role": "developer", "content": INTERPRET_PROMPT},
+                    {"role": "user", "content": problem_text}
                 ],
+                "response_format": {"type": "json_object"},
+                "max_tokens": 200,
                 "temperature": 0.1  # Más determinístico
-            },
-            timeout=15
+            }),
+            timeout=15.0
         )
+        content = orjson.loads(response.content)['choices'][0]['message']['content']
         
-        content = response.json()['choices'][0]['message']['content'].strip()
-        
-        # Limpiar markdown
-        if content.startswith('```'):
-            lines = content.split('\n')
-            content = '\n'.join(lines[1:-1])
-            if content.startswith('json'):
-                content = content[4:]
-        
-        return json.loads(content.strip())
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Solo si el modelo igual envolvió el JSON en texto o markdown
+            match = JSON_OBJECT_RE.search(content)
+            if match is None:
+                raise
+            return orjson.loads(match.group())
     except Exception as e:
-        print(f"⚠️ Error interpretando: {e}")
+        solver_logger.warning(f"⚠️ Error interpretando: {e}")
         return None
 
+# Interpretaciones por texto normalizado: problemas que solo difieren en
+# espacios o mayúsculas reutilizan la interpretación sin volver a la IA
+INTERPRETATION_CACHE_SIZE = 1024
+_interp_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+def normalize_problem(problem_text: str) -> str:
+    return re.sub(r'\s+', ' ', problem_text.strip().lower())
+
+async def get_interpretation(problem_text: str) -> Optional[Dict[str, Any]]:
+    """Parser local primero, IA solo si no calza; ambos resultados se cachean"""
+    norm = normalize_problem(problem_text)
+    interpretation = _interp_cache.get(norm)
+    if interpretation is not None:
+        _interp_cache.move_to_end(norm)
+        return interpretation
+    
+    interpretation = parse_problem(problem_text) or await interpret_problem(problem_text)
+    if interpretation:
+        _interp_cache[norm] = interpretation
+        if len(_interp_cache) > INTERPRETATION_CACHE_SIZE:
+            _interp_cache.popitem(last=False)
+    return interpretation
+
 # ============================================
 # FUNCIÓN PARA RESOLVER PROBLEMA
 # ============================================
 
-def solve_problem(problem_text: str, verbose: bool = True) -> Optional[float]:
-    """Resuelve un problema completo"""
+# Las operaciones se repiten mucho entre problemas: se compilan una sola vez
+_op_cache: Dict[str, CodeType] = {}
+
+def compile_operation(operation: str) -> CodeType:
+    """Devuelve el bytecode de la operación, compilándola solo la primera vez"""
+    code = _op_cache.get(operation)
+    if code is None:
+        code = _op_cache[operation] = compile(operation, '<op>', 'eval')
+    return code
+
+# Problemas ya resueltos (memoria + disco), por hash del texto exacto
+_solution_cache: Dict[bytes, float] = {}
+
+def _problem_key(problem_text: str) -> bytes:
+    return hashlib.blake2b(problem_text.encode(), digest_size=16).digest()
+
+def forget_solution(problem_text: str):
+    """Descarta la solución e interpretación cacheadas de un problema (p. ej. si resultó incorrecta)"""
+    key = _problem_key(problem_text)
+    _solution_cache.pop(key, None)
+    solutions_disk_cache.delete(key)
+    _interp_cache.pop(normalize_problem(problem_text), None)
+
+# Evaluador propio para la gramática restringida de las operaciones:
+# <entidad>.<atributo> y números combinados con + - * / y paréntesis.
+# Cada operación se traduce una sola vez a un árbol de closures que lee
+# directamente los diccionarios de entidades.
+OPERATION_TOKEN_RE = re.compile(r'([a-z]+[0-9]*\.[a-z_]+|[-+*/()]|\d+\.?\d*)')
+OPERATOR_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+OPERATORS = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': truediv
+}
+
+Evaluator = Callable[[Dict[str, Dict]], float]
+_evaluator_cache: Dict[str, Evaluator] = {}
+
+def _attribute(entity: str, attribute: str) -> Evaluator:
+    return lambda entities: entities[entity][attribute]
+
+def _constant(value: float) -> Evaluator:
+    return lambda entities: value
+
+def _binary(apply: Callable[[float, float], float], left: Evaluator, right: Evaluator) -> Evaluator:
+    return lambda entities: apply(left(entities), right(entities))
+
+def compile_evaluator(operation: str) -> Evaluator:
+    """Traduce la operación con Shunting-Yard a un closure, cacheado por texto.
+    
+    Lanza ValueError si la operación se sale de la gramática soportada.
+    """
+    evaluator = _evaluator_cache.get(operation)
+    if evaluator is not None:
+        return evaluator
+    
+    tokens = OPERATION_TOKEN_RE.findall(operation)
+    if ''.join(tokens) != ''.join(operation.split()):
+        raise ValueError(f"Operación no soportada: {operation}")
+    
+    operands = []
+    operators = []
+    
+    def reduce():
+        if len(operands) < 2:
+            raise ValueError(f"Operación mal formada: {operation}")
+        right = operands.pop()
+        left = operands.pop()
+        operands.append(_binary(OPERATORS[operators.pop()], left, right))
+    
+    expect_operand = True
+    for token in tokens:
+        if token == '(':
+            if not expect_operand:
+                raise ValueError(f"Operación mal formada: {operation}")
+            operators.append(token)
+        elif token == ')':
+            while operators and operators[-1] != '(':
+                reduce()
+            if not operators:
+                raise ValueError(f"Paréntesis desbalanceados: {operation}")
+            operators.pop()
+        elif token in OPERATOR_PRECEDENCE:
+            if expect_operand:
+                # Operadores unarios: se dejan al fallback con eval
+                raise ValueError(f"Operación no soportada: {operation}")
+            while operators and operators[-1] != '(' and \
+                    OPERATOR_PRECEDENCE[operators[-1]] >= OPERATOR_PRECEDENCE[token]:
+                reduce()
+            operators.append(token)
+            expect_operand = True
+            continue
+        elif not expect_operand:
+            raise ValueError(f"Operación mal formada: {operation}")
+        elif '.' in token and not token[0].isdigit():
+            entity, attribute = token.split('.')
+            operands.append(_attribute(entity, attribute))
+        else:
+            operands.append(_constant(float(token)))
+        expect_operand = token == '('
     
-    # 1. Interpretar
-    interpretation = interpret_problem(problem_text)
+    while operators:
+        if operators[-1] == '(':
+            raise ValueError(f"Paréntesis desbalanceados: {operation}")
+        reduce()
+    if len(operands) != 1:
+        raise ValueError(f"Operación mal formada: {operation}")
+    
+    evaluator = _evaluator_cache[operation] = operands[0]
+    return evaluator
+
+def evaluate_operation(operation: str, entities: Dict[str, Dict]) -> float:
+    """Evalúa la operación sobre `entities` (ValueError si no es soportada)"""
+    return compile_evaluator(operation)(entities)
+
+async def solve_problem(problem_text: str, verbose: bool = True, use_cache: bool = True) -> Optional[float]:
+    """Resuelve un problema completo.
+    
+    Con `use_cache=False` no se consulta la cache de soluciones (modo práctica),
+    aunque el resultado nuevo sí se guarda.
+    """
+    
+    # 0. Problema repetido: ni IA ni APIs
+    key = _problem_key(problem_text)
+    result = None
+    if use_cache:
+        result = _solution_cache.get(key)
+        if result is None:
+            result = solutions_disk_cache.get(key)
+    if result is not None:
+        _solution_cache[key] = result
+        if verbose:
+            solver_logger.info(f"♻️ Problema ya resuelto: {result}")
+        return result
+    
+    # 1. Interpretar (parser local primero, IA solo si no calza)
+    interpretation = await get_interpretation(problem_text)
     if not interpretation:
         return None
     
     if verbose:
-        print(f"🧠 Interpretación: {json.dumps(interpretation, ensure_ascii=False)}")
+        solver_logger.info(f"🧠 Interpretación: {json.dumps(interpretation, ensure_ascii=False)}")
+    
+    # 2. Obtener datos (todas las consultas en paralelo)
+    needs_homeworld = 'homeworld' in interpretation.get('operation', '')
+    characters = interpretation.get('characters', [])
+    planets = interpretation.get('planets', [])
+    pokemon = interpretation.get('pokemon', [])
+    
+    results = await asyncio.gather(
+        *[get_star_wars_character(name, needs_homeworld) for name in characters],
+        *[get_star_wars_planet(name) for name in planets],
+        *[get_pokemon(name) for name in pokemon]
+    )
+    char_results = results[:len(characters)]
+    planet_results = results[len(characters):len(characters) + len(planets)]
+    pokemon_results = results[len(characters) + len(planets):]
     
-    # 2. Obtener datos
     entities = {}
     
     # Personajes
-    for i, char_name in enumerate(interpretation.get('characters', []), 1):
-        char_data = get_star_wars_character(char_name)
+    for i, (char_name, char_data) in enumerate(zip(characters, char_results), 1):
         if char_data:
             entities[f'character{i}'] = char_data
             if verbose:
-                print(f"✓ {char_name}: height={char_data['height']}, mass={char_data['mass']}")
+                solver_logger.info(f"✓ {char_name}: height={char_data['height']}, mass={char_data['mass']}")
     
     # Planetas
-    for i, planet_name in enumerate(interpretation.get('planets', []), 1):
-        planet_data = get_star_wars_planet(planet_name)
+    for i, (planet_name, planet_data) in enumerate(zip(planets, planet_results), 1):
         if planet_data:
             entities[f'planet{i}'] = planet_data
             if verbose:
-                print(f"✓ {planet_name}: orbital={planet_data['orbital_period']}")
+                solver_logger.info(f"✓ {planet_name}: orbital={planet_data['orbital_period']}")
     
     # Pokémon
-    for i, pokemon_name in enumerate(interpretation.get('pokemon', []), 1):
-        pokemon_data = get_pokemon(pokemon_name)
+    for i, (pokemon_name, pokemon_data) in enumerate(zip(pokemon, pokemon_results), 1):
         if pokemon_data:
             entities[f'pokemon{i}'] = pokemon_data
             if verbose:
-                print(f"✓ {pokemon_name}: exp={pokemon_data['base_experience']}")
+                solver_logger.info(f"✓ {pokemon_name}: exp={pokemon_data['base_experience']}")
     
     # 3. Evaluar
     try:
-        class Entity:
-            def __init__(self, data):
-                for key, value in data.items():
-                    setattr(self, key, value)
-        
-        namespace = {name: Entity(data) for name, data in entities.items()}
         operation = interpretation['operation']
         
         if verbose:
-            print(f"🔢 Operación: {operation}")
+            solver_logger.info(f"🔢 Operación: {operation}")
         
-        result = eval(operation, {"__builtins__": {}}, namespace)
+        try:
+            result = evaluate_operation(operation, entities)
+        except ValueError:
+            # Fuera de la gramática soportada: usar eval como respaldo
+            namespace = {name: SimpleNamespace(**data) for name, data in entities.items()}
+            result = eval(compile_operation(operation), {"__builtins__": {}}, namespace)
         result = round(result, 10)
+        _solution_cache[key] = result
+        solutions_disk_cache.set(key, result)
         
         if verbose:
-            print(f"✅ Resultado: {result}")
+            solver_logger.info(f"✅ Resultado: {result}")
         
         return result
         
     except Exception as e:
-        print(f"❌ Error evaluando: {e}")
+        solver_logger.error(f"❌ Error evaluando: {e}")
         return None
 
 # ============================================
 # MODO PRÁCTICA
 # ============================================
 
-def test_practice():
+async def test_practice():
     """Prueba con el endpoint de práctica"""
-    print("\n" + "="*50)
-    print("🧪 MODO PRÁCTICA")
-    print("="*50 + "\n")
+    logger.info("\n" + "="*50)
+    logger.info("🧪 MODO PRÁCTICA")
+    logger.info("="*50 + "\n")
     
     try:
-        response = session.get(f"{BASE_URL}/challenge/test", headers=HEADERS, timeout=10)
+        response = await get_with_retry(f"{BASE_URL}/challenge/test", headers=HEADERS)
         
         if response.status_code != 200:
-            print(f"❌ Error HTTP {response.status_code}: {response.text}")
+            logger.error(f"❌ Error HTTP {response.status_code}: {response.text}")
             return
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        print("📦 Respuesta del servidor:")
-        print(json.dumps(data, indent=2, ensure_ascii=False))
-        print("\n" + "="*50 + "\n")
+        logger.info("📦 Respuesta del servidor:")
+        logger.info(json.dumps(data, indent=2, ensure_ascii=False))
+        logger.info("\n" + "="*50 + "\n")
         
         if 'problem' not in data:
-            print("❌ No hay campo 'problem'")
+            logger.error("❌ No hay campo 'problem'")
             return
         
-        print(f"📝 Problema:\n{data['problem']}\n")
+        logger.info(f"📝 Problema:\n{data['problem']}\n")
         
         # Verificar si tiene la solución
         has_solution = 'solution' in data
         if has_solution:
-            print(f"🎯 Solución esperada: {data['solution']}")
+            logger.info(f"🎯 Solución esperada: {data['solution']}")
             
         # Verificar si tiene la expresión
         if 'expression' in data:
-            print(f"📐 Expresión correcta: {data['expression']}\n")
+            logger.info(f"📐 Expresión correcta: {data['expression']}\n")
         
-        result = solve_problem(data['problem'], verbose=True)
+        # Sin cache de soluciones: la práctica debe volver a resolver siempre
+        result = await solve_problem(data['problem'], verbose=True, use_cache=False)
         
         if result is not None:
-            print(f"\n{'='*50}")
-            print(f"✅ Tu solución: {result}")
+            logger.info(f"\n{'='*50}")
+            logger.info(f"✅ Tu solución: {result}")
             
             if has_solution:
                 expected = data['solution']
                 match = abs(result - expected) < 1e-9
-                print(f"💯 {'✓ CORRECTO' if match else '✗ INCORRECTO'}")
+                logger.info(f"💯 {'✓ CORRECTO' if match else '✗ INCORRECTO'}")
                 if not match:
-                    print(f"   Esperado: {expected}")
-                    print(f"   Obtenido: {result}")
-                    print(f"   Diferencia: {abs(result - expected)}")
-            print("="*50)
+                    logger.info(f"   Esperado: {expected}")
+                    logger.info(f"   Obtenido: {result}")
+                    logger.info(f"   Diferencia: {abs(result - expected)}")
+                    # No dejar una respuesta incorrecta en cache para el desafío real
+                    forget_solution(data['problem'])
+            logger.info("="*50)
         else:
-            print("\n❌ No se pudo resolver")
+            logger.error("\n❌ No se pudo resolver")
             if has_solution:
-                print(f"La respuesta correcta era: {data['solution']}")
+                logger.info(f"La respuesta correcta era: {data['solution']}")
             
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error: {e}")
 
 # ============================================
 # DESAFÍO REAL (OPTIMIZADO)
 # ============================================
 
-def run_challenge():
+async def submit_and_fetch_next(problem_id: Any, answer: float) -> Dict:
+    """Envía la respuesta; el servidor responde con el siguiente problema"""
+    # Cuerpo serializado directo a bytes, sin pasar por el serializador del cliente
+    body = orjson.dumps({"problem_id": problem_id, "answer": answer})
+    response = await session.post(SOLUTION_URL, headers=HEADERS, content=body)
+    return orjson.loads(response.content)
+
+CHALLENGE_TIME_LIMIT = 175  # Terminar 5s antes
+
+def is_problem(payload: Any) -> bool:
+    """Indica si una respuesta del servidor trae un problema utilizable"""
+    return isinstance(payload, dict) and 'problem' in payload and 'id' in payload
+
+async def run_challenge():
     """Ejecuta el desafío real optimizado"""
-    print("\n" + "="*50)
-    print("🚀 INICIANDO DESAFÍO REAL")
-    print("="*50 + "\n")
+    logger.info("\n" + "="*50)
+    logger.info("🚀 INICIANDO DESAFÍO REAL")
+    logger.info("="*50 + "\n")
+    
+    # Durante el desafío solo interesan advertencias y errores de la resolución
+    solver_logger.setLevel(logging.WARNING)
     
     start_time = time.time()
     problems_solved = 0
     problems_attempted = 0
+    solve_task = None
     
     try:
         # Iniciar
-        response = session.get(f"{BASE_URL}/challenge/start", headers=HEADERS, timeout=10)
-        current_problem = response.json()
+        response = await get_with_retry(f"{BASE_URL}/challenge/start", headers=HEADERS)
+        if response.status_code != 200:
+            logger.error(f"❌ Error HTTP {response.status_code} al iniciar: {response.text}")
+            return
+        current_problem = orjson.loads(response.content)
+        if not is_problem(current_problem):
+            logger.error(f"❌ Respuesta inesperada al iniciar: {current_problem}")
+            return
         
-        while time.time() - start_time < 175:  # Terminar 5s antes
+        # Pipeline: el servidor entrega el siguiente problema solo en la
+        # respuesta de cada envío, así que hay un único problema en curso; su
+        # resolución arranca apenas llega el texto, antes de imprimir nada
+        solve_task = asyncio.create_task(solve_problem(current_problem['problem'], verbose=False))
+        
+        while time.time() - start_time < CHALLENGE_TIME_LIMIT:
             problems_attempted += 1
             elapsed = int(time.time() - start_time)
             
-            print(f"\n{'='*50}")
-            print(f"⏱️  {elapsed}s | Problema #{problems_attempted} | Resueltos: {problems_solved}")
-            print(f"{'='*50}\n")
+            logger.info(f"\n{'='*50}")
+            logger.info(f"⏱️  {elapsed}s | Problema #{problems_attempted} | Resueltos: {problems_solved}")
+            logger.info(f"{'='*50}\n")
             
             # Resolver con menos verbosidad
-            answer = solve_problem(current_problem['problem'], verbose=False)
+            answer = await solve_task
+            solve_task = None
             
-            if answer is None:
-                print("⚠️ Saltando problema...")
+            skipped = answer is None
+            if skipped:
                 answer = 0
-            else:
-                print(f"✅ Respuesta: {answer}")
             
             # Enviar
+            submit_task = asyncio.create_task(submit_and_fetch_next(current_problem['id'], answer))
+            
+            if skipped:
+                logger.warning("⚠️ Saltando problema...")
+            else:
+                logger.info(f"✅ Respuesta: {answer}")
+            
+            remaining = CHALLENGE_TIME_LIMIT - (time.time() - start_time)
+            done, _ = await asyncio.wait(
+                {submit_task},
+                timeout=max(remaining, 0),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                submit_task.cancel()
+                break
+            
             try:
-                response = session.post(
-                    f"{BASE_URL}/challenge/solution",
-                    headers=HEADERS,
-                    json={
-                        "problem_id": current_problem['id'],
-                        "answer": answer
-                    },
-                    timeout=10
-                )
-                
-                result = response.json()
-                
-                if 'problem' in result:
-                    problems_solved += 1
-                    current_problem = result
-                else:
-                    print(f"\n🏁 Fin: {result}")
-                    break
-                    
+                result = submit_task.result()
             except Exception as e:
-                print(f"❌ Error enviando: {e}")
+                logger.error(f"❌ Error enviando: {e}")
+                break
+            
+            if is_problem(result):
+                problems_solved += 1
+                current_problem = result
+                solve_task = asyncio.create_task(solve_problem(current_problem['problem'], verbose=False))
+            elif 'problem' in result:
+                logger.error(f"❌ Respuesta inesperada al enviar: {result}")
+                break
+            else:
+                logger.info(f"\n🏁 Fin: {result}")
                 break
         
         elapsed = int(time.time() - start_time)
-        print(f"\n{'='*50}")
-        print(f"🏁 DESAFÍO COMPLETADO")
-        print(f"📊 Resueltos: {problems_solved}/{problems_attempted}")
-        print(f"⏱️  Tiempo: {elapsed}s")
-        print(f"⚡ Velocidad: {problems_solved/(elapsed/60):.1f} problemas/minuto")
-        print(f"{'='*50}\n")
+        logger.info(f"\n{'='*50}")
+        logger.info(f"🏁 DESAFÍO COMPLETADO")
+        logger.info(f"📊 Resueltos: {problems_solved}/{problems_attempted}")
+        logger.info(f"⏱️  Tiempo: {elapsed}s")
+        logger.info(f"⚡ Velocidad: {problems_solved/(elapsed/60):.1f} problemas/minuto")
+        logger.info(f"{'='*50}\n")
         
     except Exception as e:
-        print(f"❌ Error crítico: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error crítico: {e}")
+    finally:
+        if solve_task is not None:
+            solve_task.cancel()
+        solver_logger.setLevel(logging.NOTSET)
 
 # ============================================
 # MENÚ
 # ============================================
 
+async def main(choice: str):
+    """Crea la sesión HTTP una sola vez y ejecuta la opción elegida"""
+    global session, swapi_semaphore, pokeapi_semaphore
+    swapi_semaphore = asyncio.Semaphore(SWAPI_CONCURRENCY)
+    pokeapi_semaphore = asyncio.Semaphore(POKEAPI_CONCURRENCY)
+    log_listener.start()
+    try:
+        async with create_session() as session:
+            await warm_caches()
+            if choice == "1":
+                await test_practice()
+            elif choice == "2":
+                await run_challenge()
+            elif choice == "3":
+                for i in range(5):
+                    logger.info(f"\n{'='*50}")
+                    logger.info(f"PRUEBA {i+1}/5")
+                    logger.info(f"{'='*50}")
+                    await test_practice()
+                    await asyncio.sleep(1)
+    finally:
+        # Vacía la cola de logs antes de salir
+        log_listener.stop()
+
 if __name__ == "__main__":
+    # Event loop basado en libuv (no disponible en Windows)
+    if sys.platform != 'win32':
+        import uvloop
+        uvloop.install()
+    
     print("="*50)
     print("🌟 ADERESO CHALLENGE SOLVER - OPTIMIZED")
     print("="*50)
@@ -401,20 +976,13 @@ if __name__ == "__main__":
     
     choice = input("\nOpción: ")
     
-    if choice == "1":
-        test_practice()
+    if choice in ("1", "3"):
+        asyncio.run(main(choice))
     elif choice == "2":
         confirm = input("\n⚠️ ¿Comenzar desafío real? (s/n): ")
         if confirm.lower() == 's':
             print("\n🔥 Iniciando en 3 segundos...")
             time.sleep(3)
-            run_challenge()
-    elif choice == "3":
-        for i in range(5):
-            print(f"\n{'='*50}")
-            print(f"PRUEBA {i+1}/5")
-            print(f"{'='*50}")
-            test_practice()
-            time.sleep(1)
+            asyncio.run(main(choice))
     else:
-        print("Opción inválida")
\ No newline at end of file
+        print("Opción inválida")